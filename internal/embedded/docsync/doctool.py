@@ -38,10 +38,14 @@ import sqlite3
 import sys
 import os
 import re
+import itertools
+import mmap
 import hashlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 from dataclasses import dataclass, field
 
 # =============================================================================
@@ -65,6 +69,9 @@ VALID_GENRES = [
     "reference",     # reference documentation
 ]
 
+# Path fragments that become memory tags when ingesting without explicit tags
+TAG_HINTS = ['infra', 'agents', 'apps', 'shared', 'pipelines', 'ecs', 'lambda']
+
 # Required sections by document type
 REQUIRED_SECTIONS = {
     "overview": [
@@ -439,9 +446,12 @@ class DocIndex:
             schema = f.read()
         conn = self.get_connection()
         conn.executescript(schema)
+        rehashed = DocMemory().migrate_content_hashes(conn)
         conn.commit()
         conn.close()
         print(f"Database initialized at {self.db_path}")
+        if rehashed:
+            print(f"Rehashed {rehashed} chunks to {_HASH_ALGO}")
 
     def register(self, path: str, genre: str, tags: list, title: str = None):
         """Register a document. Genre (controlled) and tags (free-form) required."""
@@ -485,18 +495,17 @@ class DocIndex:
                             title = line[2:].strip()
                             break
 
-        conn.execute("""
+        # The upsert always touches the row, so RETURNING hands back its id
+        # either way (no second lookup by path)
+        doc_id = conn.execute("""
             INSERT INTO documents (path, title, genre, created_at, updated_at, accessed_at)
             VALUES (?, ?, ?, ?, ?, ?)
             ON CONFLICT(path) DO UPDATE SET
                 updated_at = ?,
                 title = COALESCE(?, title),
                 genre = COALESCE(?, genre)
-        """, (path, title, genre, now, now, now, now, title, genre))
-
-        doc_id = conn.execute(
-            "SELECT id FROM documents WHERE path = ?", (path,)
-        ).fetchone()[0]
+            RETURNING id
+        """, (path, title, genre, now, now, now, now, title, genre)).fetchone()[0]
 
         # Create tags on-demand (free-form)
         for tag in tags:
@@ -1135,6 +1144,48 @@ class DocReports:
 # MEMORY SYSTEM (FTS5-based retrieval)
 # =============================================================================
 
+# Markdown heading line: leading '#' run (level) + heading text
+_HEADING_RE = re.compile(r'^(#+)(.*)$', re.MULTILINE)
+
+# content_hash algorithm, recorded in schema_meta so older databases get rehashed
+_HASH_ALGO = 'blake2b-256'
+
+# Chunks bound per executemany round while streaming a document in
+_INGEST_BATCH_SIZE = 500
+
+# Prepared documents allowed in flight per ingest worker process
+_PREPARE_QUEUE_DEPTH = 4
+
+# Bound parameters per IN (...) probe; stays under SQLITE_MAX_VARIABLE_NUMBER
+# (999 on SQLite builds older than 3.32)
+_MAX_IN_PARAMS = 500
+
+# Any TAG_HINTS entry; the lookahead also reports hints overlapping a previous match
+_TAG_RE = re.compile('(?=(' + '|'.join(re.escape(h) for h in TAG_HINTS) + '))')
+
+# Chunk write statements, shared by the single-row and bulk paths so each
+# one is compiled once and then served from the connection's statement cache
+_INSERT_META_SQL = (
+    "INSERT INTO chunk_meta (source, section, chunk_type, created_at, content_hash) "
+    "VALUES (?, ?, ?, ?, ?) ON CONFLICT(content_hash) DO NOTHING RETURNING id"
+)
+_INSERT_DOC_META_SQL = (
+    "INSERT INTO chunk_meta (source, section, chunk_type, created_at, content_hash) "
+    "VALUES (?, ?, 'doc', ?, ?)"
+)
+_INSERT_FTS_SQL = (
+    "INSERT INTO chunks_fts (rowid, content, source, section, tags) "
+    "VALUES (?, ?, ?, ?, ?)"
+)
+_UPSERT_FILE_HASH_SQL = (
+    "INSERT OR REPLACE INTO file_hashes (path, mtime_ns, size, whole_hash) "
+    "VALUES (?, ?, ?, ?)"
+)
+
+# Prepared statements kept per connection (sqlite3 default is 128); the IN (...)
+# probes compile one statement per distinct group size
+_STATEMENT_CACHE_SIZE = 512
+
 class DocMemory:
     """Handles content chunking and FTS5-based retrieval for AI collaboration."""
 
@@ -1142,135 +1193,361 @@ class DocMemory:
         self.db_path = DB_PATH
 
     def get_connection(self):
-        conn = sqlite3.connect(self.db_path)
+        conn = sqlite3.connect(self.db_path, cached_statements=_STATEMENT_CACHE_SIZE)
         conn.execute("PRAGMA foreign_keys = ON")
+        # WAL + relaxed sync: one fsync per checkpoint instead of per commit
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+        conn.execute("PRAGMA temp_store = MEMORY")
+        conn.execute("PRAGMA cache_size = -65536")  # 64 MiB page cache
         conn.row_factory = sqlite3.Row
         return conn
 
     def _hash_content(self, content: str) -> str:
-        """Generate SHA256 hash for deduplication."""
-        return hashlib.sha256(content.encode()).hexdigest()
+        """Generate BLAKE2b-256 hash (64 hex chars) for deduplication; not security-sensitive."""
+        return hashlib.blake2b(content.encode(), digest_size=32, usedforsecurity=False).hexdigest()
 
-    def _chunk_document(self, content: str, source: str) -> list[dict]:
+    def migrate_content_hashes(self, conn) -> int:
         """
-        Chunk a markdown document by headings.
-        Returns list of {content, section, source}.
+        Recompute chunk_meta.content_hash from chunks_fts.content unless
+        schema_meta says the rows already use _HASH_ALGO (databases built
+        before the switch hold SHA-256 hashes, which would never match again).
+        Does not commit. Returns the number of rows rehashed.
         """
-        chunks = []
-        lines = content.split('\n')
+        marker = conn.execute(
+            "SELECT value FROM schema_meta WHERE key = 'hash_algo'"
+        ).fetchone()
+        if marker and marker[0] == _HASH_ALGO:
+            return 0
 
-        current_section = []
-        current_headings = []
+        rows = conn.execute("""
+            SELECT m.id, c.content
+            FROM chunk_meta m
+            JOIN chunks_fts c ON c.rowid = m.id
+        """).fetchall()
+        conn.executemany(
+            "UPDATE chunk_meta SET content_hash = ? WHERE id = ?",
+            [(self._hash_content(row['content']), row['id']) for row in rows]
+        )
+        conn.execute(
+            "INSERT OR REPLACE INTO schema_meta (key, value) VALUES ('hash_algo', ?)",
+            (_HASH_ALGO,)
+        )
+        return len(rows)
 
-        for line in lines:
-            # Detect heading
-            if line.startswith('#'):
-                # Save previous section if it has content
-                if current_section:
-                    section_content = '\n'.join(current_section).strip()
-                    if section_content and len(section_content) > 50:  # Skip tiny sections
-                        chunks.append({
+    def _insert_chunk(self, conn, content: str, source: str, section: str, tags: list[str],
+                      chunk_type: str, content_hash: str, created_at: str = None) -> bool:
+        """
+        Insert a chunk into chunk_meta and chunks_fts on the caller's
+        transaction. created_at defaults to now; batch callers pass one shared value.
+        Does not commit. Returns False if the content is a duplicate.
+        """
+        if created_at is None:
+            created_at = datetime.now().isoformat()
+
+        # Insert into metadata table; the UNIQUE content_hash makes a duplicate a no-op
+        row = conn.execute(
+            _INSERT_META_SQL, (source, section, chunk_type, created_at, content_hash)
+        ).fetchone()
+
+        if row is None:
+            return False  # Skip duplicate
+
+        # Insert into FTS table (space-separated tags for tags: MATCH queries)
+        conn.execute(_INSERT_FTS_SQL, (row[0], content, source, section, ' '.join(tags)))
+
+        return True
+
+    def _chunk_document(self, content: str, source: str) -> Iterator[dict]:
+        """
+        Chunk a markdown document by headings.
+        Yields {content, content_hash, section, source} per section, lazily.
+        A section repeating an earlier one (same hash) is not yielded again.
+        """
+        seen_hashes = set()
+        current_headings = []
+        section_start = 0  # Offset where the section being built begins
+
+        # Every line starting with '#' opens a section (same rule as startswith('#')).
+        # A section runs from its heading line up to the next heading, so it is one
+        # slice of `content`; text before the first heading is a section of its own.
+        for m in _HEADING_RE.finditer(content):
+            section_end = m.start()
+
+            # A span of <= 50 chars can't strip to more, so skip it without slicing
+            if section_end - section_start > 50:
+                section_content = content[section_start:section_end].strip()
+                if len(section_content) > 50:  # Skip tiny sections
+                    content_hash = self._hash_content(section_content)
+                    if content_hash not in seen_hashes:
+                        seen_hashes.add(content_hash)
+                        yield {
                             'content': section_content,
+                            'content_hash': content_hash,
                             'section': ' > '.join(current_headings) if current_headings else 'Introduction',
                             'source': source,
-                        })
-                    current_section = []
+                        }
+            section_start = section_end
 
-                # Update heading stack
-                level = len(line) - len(line.lstrip('#'))
-                heading_text = line.lstrip('#').strip()
+            # Trim heading stack to current level (in place; level = length of the # run)
+            del current_headings[m.end(1) - m.start(1) - 1:]
+            current_headings.append(m.group(2).strip())
 
-                # Trim heading stack to current level
-                current_headings = current_headings[:level-1]
-                current_headings.append(heading_text)
+        # Don't forget the last section
+        if len(content) - section_start > 50:
+            section_content = content[section_start:].strip()
+            if len(section_content) > 50:
+                content_hash = self._hash_content(section_content)
+                if content_hash not in seen_hashes:
+                    seen_hashes.add(content_hash)
+                    yield {
+                        'content': section_content,
+                        'content_hash': content_hash,
+                        'section': ' > '.join(current_headings) if current_headings else 'Content',
+                        'source': source,
+                    }
+
+    def _infer_tags(self, path: str) -> list[str]:
+        """Infer tags from TAG_HINTS found in a document path (in TAG_HINTS order)."""
+        found = {m.group(1) for m in _TAG_RE.finditer(path.lower())}
+        return [hint for hint in TAG_HINTS if hint in found] or ['general']
+
+    def _filter_new_hashes(self, conn, hashes: list[str]) -> set[str]:
+        """Return the subset of hashes not yet in chunk_meta, probing in merged IN (...) batches."""
+        new = set(hashes)
+        for i in range(0, len(hashes), _MAX_IN_PARAMS):
+            group = hashes[i:i + _MAX_IN_PARAMS]
+            placeholders = ','.join('?' * len(group))
+            new.difference_update(r[0] for r in conn.execute(
+                f"SELECT content_hash FROM chunk_meta WHERE content_hash IN ({placeholders})",
+                group
+            ))
+        return new
 
-            current_section.append(line)
+    def _insert_doc_chunks(self, conn, chunks: list[dict], tags: list[str], created_at: str) -> int:
+        """
+        Bulk-insert document chunks on the caller's transaction.
+        Does not commit. Returns the number of new (non-duplicate) chunks.
+        """
+        # One dedup probe for all chunk hashes instead of one per chunk. Chunks
+        # come from the chunker already free of repeats within the document, and
+        # earlier batches are visible to the probe, so this is the only filter.
+        fresh = self._filter_new_hashes(conn, [chunk['content_hash'] for chunk in chunks])
+        new = {chunk['content_hash']: chunk for chunk in chunks if chunk['content_hash'] in fresh}
 
-        # Don't forget the last section
-        if current_section:
-            section_content = '\n'.join(current_section).strip()
-            if section_content and len(section_content) > 50:
-                chunks.append({
-                    'content': section_content,
-                    'section': ' > '.join(current_headings) if current_headings else 'Content',
-                    'source': source,
-                })
-
-        return chunks
-
-    def ingest(self, path: str, tags: list = None) -> int:
-        """Ingest a document into the memory system. Returns chunk count."""
-        full_path = DOCS_ROOT / path
-        if not full_path.exists():
-            print(f"File not found: {path}")
+        if not new:
             return 0
 
-        with open(full_path) as f:
-            content = f.read()
+        conn.executemany(_INSERT_DOC_META_SQL, [
+            (chunk['source'], chunk['section'], created_at, content_hash)
+            for content_hash, chunk in new.items()
+        ])
+
+        # Map hashes back to the ids just assigned, for the FTS rowids
+        hashes = list(new)
+        ids = {}
+        for i in range(0, len(hashes), _MAX_IN_PARAMS):
+            group = hashes[i:i + _MAX_IN_PARAMS]
+            placeholders = ','.join('?' * len(group))
+            ids.update(conn.execute(
+                f"SELECT content_hash, id FROM chunk_meta WHERE content_hash IN ({placeholders})",
+                group
+            ))
 
-        chunks = self._chunk_document(content, path)
+        # Space-separated tags for tags: MATCH queries
+        tags_str = ' '.join(tags)
+        conn.executemany(_INSERT_FTS_SQL, [
+            (ids[content_hash], chunk['content'], chunk['source'], chunk['section'], tags_str)
+            for content_hash, chunk in new.items()
+        ])
 
-        if not chunks:
-            print(f"No chunks generated from: {path}")
-            return 0
+        return len(new)
 
-        conn = self.get_connection()
-        now = datetime.now().isoformat()
+    def _prepare_document(self, path: str, full_path: Path, cached: Optional[tuple]) -> dict:
+        """
+        Read, hash and chunk one document: the CPU-bound half of ingestion.
+        Touches no database state so it can run in a worker process; `cached`
+        is the file's (mtime_ns, size, whole_hash) row from file_hashes, if any.
 
-        # Infer tags from path if not provided
-        if not tags:
-            tags = []
-            path_lower = path.lower()
-            for tag_hint in ['infra', 'agents', 'apps', 'shared', 'pipelines', 'ecs', 'lambda']:
-                if tag_hint in path_lower:
-                    tags.append(tag_hint)
+        Returns {path, file_row, chunks}. file_row is the fingerprint to record
+        (None if nothing changed) and chunks is None if the content is unchanged.
+        """
+        prepared = {'path': path, 'file_row': None, 'chunks': None}
+
+        stat = full_path.stat()
+        if stat.st_size == 0:
+            prepared['chunks'] = []  # Nothing to chunk (and mmap rejects empty files)
+            return prepared
+
+        if cached and cached[0] == stat.st_mtime_ns and cached[1] == stat.st_size:
+            return prepared  # Untouched since last ingest
+
+        # Map the file instead of reading it: hash and decode straight from the
+        # page cache with no intermediate bytes copy. Decode happens only if the
+        # bytes changed; chunk hashes are computed while chunking.
+        content = None
+        with full_path.open('rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            whole_hash = hashlib.blake2b(data, digest_size=32, usedforsecurity=False).hexdigest()
+            if not cached or cached[2] != whole_hash:
+                # Same newlines as a text-mode read, so chunk hashes match
+                # what earlier versions stored for CRLF documents
+                content = str(data, 'utf-8').replace('\r\n', '\n').replace('\r', '\n')
+        prepared['file_row'] = (path, stat.st_mtime_ns, stat.st_size, whole_hash)
+
+        # Touched but byte-identical: only the new mtime gets recorded
+        if content is not None:
+            prepared['chunks'] = self._chunk_document(content, path)
+        return prepared
+
+    def _prepare_document_eager(self, path: str, full_path: Path, cached: Optional[tuple]) -> dict:
+        """_prepare_document for worker processes: chunks materialized to pickle back."""
+        prepared = self._prepare_document(path, full_path, cached)
+        if prepared['chunks'] is not None:
+            prepared['chunks'] = list(prepared['chunks'])
+        return prepared
+
+    def _prepare_documents(self, jobs: list[tuple]) -> Iterator[dict]:
+        """
+        Yield _prepare_document results for (path, full_path, cached) jobs, in order.
+        Several documents are fanned out over a process pool, with at most
+        _PREPARE_QUEUE_DEPTH results per worker in flight to bound memory.
+        A document that can't be read or decoded comes back as {path, error}
+        instead of ending the run.
+        """
+        workers = min(os.cpu_count() or 1, len(jobs))
+        if workers <= 1:
+            for job in jobs:
+                try:
+                    prepared = self._prepare_document(*job)
+                except (OSError, ValueError) as e:
+                    prepared = {'path': job[0], 'error': e}
+                yield prepared
+            return
+
+        def collect(path, future):
+            try:
+                return future.result()
+            except (OSError, ValueError) as e:
+                return {'path': path, 'error': e}
+
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = deque()
+            for job in jobs:
+                pending.append((job[0], pool.submit(self._prepare_document_eager, *job)))
+                if len(pending) >= _PREPARE_QUEUE_DEPTH * workers:
+                    yield collect(*pending.popleft())
+            while pending:
+                yield collect(*pending.popleft())
+
+    def _get_file_hashes(self, conn, paths: list[str]) -> dict[str, tuple]:
+        """Map each path with a stored fingerprint to its (mtime_ns, size, whole_hash)."""
+        cached = {}
+        for i in range(0, len(paths), _MAX_IN_PARAMS):
+            group = paths[i:i + _MAX_IN_PARAMS]
+            placeholders = ','.join('?' * len(group))
+            for row in conn.execute(
+                f"SELECT path, mtime_ns, size, whole_hash FROM file_hashes WHERE path IN ({placeholders})",
+                group
+            ):
+                cached[row['path']] = (row['mtime_ns'], row['size'], row['whole_hash'])
+        return cached
+
+    def _store_document(self, conn, prepared: dict, tags: list, created_at: str) -> tuple[int, int]:
+        """
+        Write a _prepare_document result on the caller's transaction.
+        Does not commit. Returns (new chunks, chunks generated).
+        """
+        inserted = 0
+        chunked = 0
+        if prepared['chunks'] is not None:
+            # Infer tags from path if not provided
             if not tags:
-                tags = ['general']
+                tags = self._infer_tags(prepared['path'])
 
-        tags_str = ' '.join(tags)  # Space-separated for FTS
-        tags_csv = ','.join(tags)  # Comma-separated for metadata
+            # Stream chunks into the transaction in bounded batches
+            chunks = iter(prepared['chunks'])
+            while True:
+                batch = list(itertools.islice(chunks, _INGEST_BATCH_SIZE))
+                if not batch:
+                    break
+                chunked += len(batch)
+                inserted += self._insert_doc_chunks(conn, batch, tags, created_at)
 
-        inserted = 0
-        for chunk in chunks:
-            content_hash = self._hash_content(chunk['content'])
+        if prepared['file_row'] is not None:
+            conn.execute(_UPSERT_FILE_HASH_SQL, prepared['file_row'])
 
-            # Check for duplicate
-            existing = conn.execute(
-                "SELECT id FROM chunk_meta WHERE content_hash = ?", (content_hash,)
-            ).fetchone()
+        return inserted, chunked
 
-            if existing:
-                continue  # Skip duplicate
+    def ingest_many(self, paths: list[str], tags: list = None, quiet: bool = False) -> int:
+        """
+        Ingest documents into the memory system. Returns total chunk count.
+        Files unchanged since their last ingest (same mtime+size, or same
+        whole-file hash) are skipped without chunking. Reading, hashing and
+        chunking run in parallel across files; all writes happen here. Each
+        document commits on its own, so the write lock is held for one
+        document at a time and a file that fails to prepare is reported (on
+        stderr, even when quiet) and skipped.
+        """
+        existing = []
+        for path in paths:
+            if (DOCS_ROOT / path).exists():
+                existing.append(path)
+            elif not quiet:
+                print(f"File not found: {path}")
+        if not existing:
+            return 0
 
-            # Insert into metadata table
-            cursor = conn.execute("""
-                INSERT INTO chunk_meta (source, section, tags, chunk_type, created_at, content_hash)
-                VALUES (?, ?, ?, 'doc', ?, ?)
-            """, (chunk['source'], chunk['section'], tags_csv, now, content_hash))
+        conn = self.get_connection()
+        now = datetime.now().isoformat()
 
-            # Insert into FTS table
-            conn.execute("""
-                INSERT INTO chunks_fts (rowid, content, source, section, tags)
-                VALUES (?, ?, ?, ?, ?)
-            """, (cursor.lastrowid, chunk['content'], chunk['source'], chunk['section'], tags_str))
+        inserted = 0
+        try:
+            cached = self._get_file_hashes(conn, existing)
+            jobs = [(path, DOCS_ROOT / path, cached.get(path)) for path in existing]
 
-            inserted += 1
+            for prepared in self._prepare_documents(jobs):
+                path = prepared['path']
+                if 'error' in prepared:
+                    print(f"Skipped: {path} ({prepared['error']})", file=sys.stderr)
+                    continue
+                if prepared['chunks'] is None and prepared['file_row'] is None:
+                    if not quiet:
+                        print(f"Unchanged: {path}")
+                    continue
 
-        conn.commit()
-        conn.close()
+                # One short write transaction per document (WAL makes the commit cheap)
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    count, chunked = self._store_document(conn, prepared, tags, now)
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                    raise
+                inserted += count
+
+                if quiet:
+                    continue
+                if prepared['chunks'] is None:
+                    print(f"Unchanged: {path}")
+                elif not chunked:
+                    print(f"No chunks generated from: {path}")
+                else:
+                    print(f"Ingested: {path} ({count} chunks)")
+        finally:
+            conn.close()
 
-        print(f"Ingested: {path} ({inserted} chunks)")
         return inserted
 
+    def ingest(self, path: str, tags: list = None, quiet: bool = False) -> int:
+        """Ingest a document into the memory system. Returns chunk count."""
+        return self.ingest_many([path], tags, quiet)
+
     def ingest_all(self) -> int:
         """Ingest all indexed documents."""
         index = DocIndex()
         rows = index.query_all()
 
-        total = 0
-        for row in rows:
-            count = self.ingest(row['path'])
-            total += count
+        total = self.ingest_many([row['path'] for row in rows])
 
         print(f"\nTotal: {total} chunks from {len(rows)} documents")
         return total
@@ -1286,40 +1563,21 @@ class DocMemory:
             return False
 
         conn = self.get_connection()
-        now = datetime.now().isoformat()
+        now = datetime.now()  # One clock read for created_at and the session source
         content_hash = self._hash_content(content)
 
-        # Check for duplicate
-        existing = conn.execute(
-            "SELECT id FROM chunk_meta WHERE content_hash = ?", (content_hash,)
-        ).fetchone()
-
-        if existing:
-            print("Note already exists (duplicate content)")
-            conn.close()
-            return False
-
         # Default source to session date
         if not source:
-            source = f"session:{datetime.now().strftime('%Y-%m-%d')}"
+            source = f"session:{now.strftime('%Y-%m-%d')}"
 
-        tags_str = ' '.join(tags)
-        tags_csv = ','.join(tags)
-
-        # Insert into metadata table
-        cursor = conn.execute("""
-            INSERT INTO chunk_meta (source, section, tags, chunk_type, created_at, content_hash)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """, (source, 'Note', tags_csv, chunk_type, now, content_hash))
-
-        # Insert into FTS table
-        conn.execute("""
-            INSERT INTO chunks_fts (rowid, content, source, section, tags)
-            VALUES (?, ?, ?, ?, ?)
-        """, (cursor.lastrowid, content, source, 'Note', tags_str))
-
-        conn.commit()
-        conn.close()
+        try:
+            if not self._insert_chunk(conn, content, source, 'Note', tags, chunk_type,
+                                      content_hash, now.isoformat()):
+                print("Note already exists (duplicate content)")
+                return False
+            conn.commit()
+        finally:
+            conn.close()
 
         print(f"Added {chunk_type}: {content[:50]}...")
         print(f"  Tags: {', '.join(tags)}")
@@ -1489,7 +1747,7 @@ class DocMemory:
 
         return results
 
-    def refresh(self, path: str = None) -> dict:
+    def refresh(self, path: str = None, quiet: bool = False) -> dict:
         """
         Refresh doc chunks from source files.
         Deletes stale chunks, re-ingests current content.
@@ -1498,6 +1756,7 @@ class DocMemory:
         Args:
             path: Optional path to refresh (relative to _docs/).
                   If None, refreshes all doc-type chunks.
+            quiet: Suppress per-document progress output.
 
         Returns:
             Dictionary with deleted, ingested, and sources counts.
@@ -1508,11 +1767,14 @@ class DocMemory:
             # Single document refresh
             sources = [path]
         else:
-            # All docs - get unique sources where type='doc'
-            rows = conn.execute(
-                "SELECT DISTINCT source FROM chunk_meta WHERE chunk_type = 'doc'"
-            ).fetchall()
-            sources = [row['source'] for row in rows]
+            # All docs - unique sources where type='doc', plus every fingerprinted
+            # file (its sections may all be stored under another source)
+            rows = conn.execute("""
+                SELECT source FROM chunk_meta WHERE chunk_type = 'doc'
+                UNION
+                SELECT path FROM file_hashes
+            """).fetchall()
+            sources = [row[0] for row in rows]
 
         deleted = 0
         ingested = 0
@@ -1529,17 +1791,25 @@ class DocMemory:
                 conn.execute("DELETE FROM chunk_meta WHERE id = ?", (chunk['id'],))
                 deleted += 1
 
+            # Forget the file fingerprint so the re-ingest below is not skipped
+            conn.execute("DELETE FROM file_hashes WHERE path = ?", (source,))
+
             conn.commit()
 
-            # Re-ingest if file exists
-            full_path = DOCS_ROOT / source
-            if full_path.exists():
-                # Close connection before ingesting (ingest opens its own)
-                conn.close()
-                ingested += self.ingest(source)
-                conn = self.get_connection()
+        # Forget every file fingerprint, not just the refreshed ones: dedup is
+        # global, so a deleted chunk may have been the only copy of a section
+        # in another file that would otherwise be skipped as unchanged
+        if deleted:
+            conn.execute("DELETE FROM file_hashes")
+            conn.commit()
 
+        # Close connection before ingesting (ingest_many opens its own)
         conn.close()
+
+        # Re-ingest every source whose file still exists, in one parallel pass
+        existing = [source for source in sources if (DOCS_ROOT / source).exists()]
+        if existing:
+            ingested = self.ingest_many(existing, quiet=quiet)
         return {'deleted': deleted, 'ingested': ingested, 'sources': len(sources)}
 
 
@@ -18,6 +18,8 @@ import sqlite3
 import os
 import re
 import logging
+import atexit
+import threading
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Optional
@@ -48,15 +50,56 @@ log = logging.getLogger("doc-sync-mcp")
 # DATABASE ACCESS
 # =============================================================================
 
+# Prepared statements kept per connection (sqlite3 default is 128); the IN (...)
+# probes compile one statement per distinct group size
+_STATEMENT_CACHE_SIZE = 512
+
+# Per-connection page cache and memory-mapped read window
+_PAGE_CACHE_KIB = 65536  # 64 MiB
+_MMAP_SIZE = 268435456  # 256 MiB
+
+# One long-lived connection per thread, so tool calls reuse an open file
+# and a warm page cache instead of reconnecting and re-running PRAGMAs
+_LOCAL = threading.local()
+
+
 def get_connection():
-    """Get a database connection."""
+    """Get this thread's database connection, opening it on first use."""
+    conn = getattr(_LOCAL, "conn", None)
+    if conn is not None:
+        return conn
+
     if not DB_PATH.exists():
         raise RuntimeError(f"Database not found: {DB_PATH}. Run 'doctool index init' first.")
-    conn = sqlite3.connect(DB_PATH)
+    conn = sqlite3.connect(DB_PATH, cached_statements=_STATEMENT_CACHE_SIZE)
     conn.execute("PRAGMA foreign_keys = ON")
+    # WAL + relaxed sync: one fsync per checkpoint instead of per commit
+    conn.execute("PRAGMA journal_mode = WAL")
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.execute("PRAGMA temp_store = MEMORY")
+    conn.execute(f"PRAGMA cache_size = -{_PAGE_CACHE_KIB}")  # Negative = KiB, not pages
+    conn.execute(f"PRAGMA mmap_size = {_MMAP_SIZE}")
     conn.row_factory = sqlite3.Row
+    _LOCAL.conn = conn
     return conn
 
+
+def release_connection(conn):
+    """Done with a get_connection() handle: discard any uncommitted work, keep it open."""
+    if conn.in_transaction:
+        conn.rollback()
+
+
+def close_connection():
+    """Close this thread's connection (next get_connection() reopens)."""
+    conn = getattr(_LOCAL, "conn", None)
+    if conn is not None:
+        conn.close()
+        _LOCAL.conn = None
+
+
+atexit.register(close_connection)
+
 # =============================================================================
 # TOOL IMPLEMENTATIONS
 # =============================================================================
@@ -156,7 +199,7 @@ def tool_doc_search(tags: list[str] = None, genre: str = None, text: str = None)
                 })
 
     finally:
-        conn.close()
+        release_connection(conn)
 
     return {"count": len(results), "documents": results}
 
@@ -199,7 +242,7 @@ def tool_doc_stats() -> dict:
         }
 
     finally:
-        conn.close()
+        release_connection(conn)
 
 
 def tool_doc_query_stale(days: int = 30) -> dict:
@@ -233,7 +276,7 @@ def tool_doc_query_stale(days: int = 30) -> dict:
         }
 
     finally:
-        conn.close()
+        release_connection(conn)
 
 
 def tool_doc_query_untracked() -> dict:
@@ -248,7 +291,7 @@ def tool_doc_query_untracked() -> dict:
     try:
         indexed = set(row[0] for row in conn.execute("SELECT path FROM documents").fetchall())
     finally:
-        conn.close()
+        release_connection(conn)
 
     all_docs = set()
     for md_file in DOCS_ROOT.rglob("*.md"):
@@ -364,16 +407,17 @@ def tool_doc_register(path: str, genre: str, tags: list[str]) -> dict:
             break
 
     try:
-        conn.execute("""
+        # The upsert always touches the row, so RETURNING hands back its id
+        # either way (no second lookup by path)
+        doc_id = conn.execute("""
             INSERT INTO documents (path, title, genre, created_at, updated_at, accessed_at)
             VALUES (?, ?, ?, ?, ?, ?)
             ON CONFLICT(path) DO UPDATE SET
                 updated_at = ?,
                 title = COALESCE(?, title),
                 genre = COALESCE(?, genre)
-        """, (path, title, genre, now, now, now, now, title, genre))
-
-        doc_id = conn.execute("SELECT id FROM documents WHERE path = ?", (path,)).fetchone()[0]
+            RETURNING id
+        """, (path, title, genre, now, now, now, now, title, genre)).fetchone()[0]
         for tag in tags:
             tag = tag.strip().lower()
             conn.execute(
@@ -389,7 +433,7 @@ def tool_doc_register(path: str, genre: str, tags: list[str]) -> dict:
         return {"success": True, "path": path, "title": title, "genre": genre, "tags": tags}
 
     finally:
-        conn.close()
+        release_connection(conn)
 
 
 def tool_doc_mark_updated(path: str) -> dict:
@@ -418,7 +462,7 @@ def tool_doc_mark_updated(path: str) -> dict:
         return {"success": True, "path": path, "updated_at": now}
 
     finally:
-        conn.close()
+        release_connection(conn)
 
 
 def tool_doc_list_tags() -> dict:
@@ -448,7 +492,7 @@ def tool_doc_list_tags() -> dict:
         }
 
     finally:
-        conn.close()
+        release_connection(conn)
 
 
 def tool_doc_list_genres() -> dict:
@@ -477,7 +521,7 @@ def tool_doc_list_genres() -> dict:
         }
 
     finally:
-        conn.close()
+        release_connection(conn)
 
 
 def tool_doc_suggest_tags(partial: str) -> dict:
@@ -504,7 +548,7 @@ def tool_doc_suggest_tags(partial: str) -> dict:
         }
 
     finally:
-        conn.close()
+        release_connection(conn)
 
 
 # =============================================================================
@@ -513,9 +557,48 @@ def tool_doc_suggest_tags(partial: str) -> dict:
 
 import hashlib
 
+# Shared ingest pipeline (doctool.py is installed alongside this file)
+from doctool import DocMemory
+
+# Chunk write statements for memory_add, compiled once and then served
+# from the connection's statement cache
+_INSERT_META_SQL = (
+    "INSERT INTO chunk_meta (source, section, chunk_type, created_at, content_hash) "
+    "VALUES (?, ?, ?, ?, ?) ON CONFLICT(content_hash) DO NOTHING RETURNING id"
+)
+_INSERT_FTS_SQL = (
+    "INSERT INTO chunks_fts (rowid, content, source, section, tags) "
+    "VALUES (?, ?, ?, ?, ?)"
+)
+
+
 def _hash_content(content: str) -> str:
-    """Generate SHA256 hash for deduplication."""
-    return hashlib.sha256(content.encode()).hexdigest()
+    """Generate BLAKE2b-256 hash (64 hex chars) for deduplication; not security-sensitive."""
+    return hashlib.blake2b(content.encode(), digest_size=32, usedforsecurity=False).hexdigest()
+
+
+def _insert_chunk(conn, content: str, source: str, section: str, tags: list[str],
+                  chunk_type: str, content_hash: str, created_at: str = None) -> bool:
+    """
+    Insert a chunk into chunk_meta and chunks_fts on the caller's
+    transaction. created_at defaults to now; batch callers pass one shared value.
+    Does not commit. Returns False if the content is a duplicate.
+    """
+    if created_at is None:
+        created_at = datetime.now().isoformat()
+
+    # Insert into metadata table; the UNIQUE content_hash makes a duplicate a no-op
+    row = conn.execute(
+        _INSERT_META_SQL, (source, section, chunk_type, created_at, content_hash)
+    ).fetchone()
+
+    if row is None:
+        return False  # Skip duplicate
+
+    # Insert into FTS table (space-separated tags for tags: MATCH queries)
+    conn.execute(_INSERT_FTS_SQL, (row[0], content, source, section, ' '.join(tags)))
+
+    return True
 
 
 def tool_memory_search(query: str, tags: list[str] = None, limit: int = 10) -> dict:
@@ -610,7 +693,7 @@ def tool_memory_search(query: str, tags: list[str] = None, limit: int = 10) -> d
         return {"query": query, "count": len(results), "results": results}
 
     finally:
-        conn.close()
+        release_connection(conn)
 
 
 def tool_memory_add(content: str, tags: list[str], source: str = None, chunk_type: str = 'note') -> dict:
@@ -633,34 +716,16 @@ def tool_memory_add(content: str, tags: list[str], source: str = None, chunk_typ
         return {"success": False, "error": "At least one tag required"}
 
     conn = get_connection()
-    now = datetime.now().isoformat()
+    now = datetime.now()  # One clock read for created_at and the session source
     content_hash = _hash_content(content)
 
-    # Check for duplicate
-    existing = conn.execute(
-        "SELECT id FROM chunk_meta WHERE content_hash = ?", (content_hash,)
-    ).fetchone()
-
-    if existing:
-        conn.close()
-        return {"success": False, "error": "Duplicate content (already exists)"}
-
     if not source:
-        source = f"session:{datetime.now().strftime('%Y-%m-%d')}"
-
-    tags_str = ' '.join(tags)
-    tags_csv = ','.join(tags)
+        source = f"session:{now.strftime('%Y-%m-%d')}"
 
     try:
-        cursor = conn.execute("""
-            INSERT INTO chunk_meta (source, section, tags, chunk_type, created_at, content_hash)
-            VALUES (?, ?, ?, ?, ?, ?)
-        """, (source, 'Note', tags_csv, chunk_type, now, content_hash))
-
-        conn.execute("""
-            INSERT INTO chunks_fts (rowid, content, source, section, tags)
-            VALUES (?, ?, ?, ?, ?)
-        """, (cursor.lastrowid, content, source, 'Note', tags_str))
+        if not _insert_chunk(conn, content, source, 'Note', tags, chunk_type, content_hash,
+                             now.isoformat()):
+            return {"success": False, "error": "Duplicate content (already exists)"}
 
         conn.commit()
 
@@ -673,7 +738,7 @@ def tool_memory_add(content: str, tags: list[str], source: str = None, chunk_typ
         }
 
     finally:
-        conn.close()
+        release_connection(conn)
 
 
 def tool_memory_stats() -> dict:
@@ -720,7 +785,7 @@ def tool_memory_stats() -> dict:
         }
 
     finally:
-        conn.close()
+        release_connection(conn)
 
 
 def tool_memory_recent(days: int = 7, limit: int = 10) -> list[dict]:
@@ -775,117 +840,7 @@ def tool_memory_recent(days: int = 7, limit: int = 10) -> list[dict]:
         return results
 
     finally:
-        conn.close()
-
-
-def _chunk_document(content: str, source: str) -> list[dict]:
-    """
-    Chunk a markdown document by headings.
-    Returns list of {content, section, source}.
-    """
-    chunks = []
-    lines = content.split('\n')
-
-    current_section = []
-    current_headings = []
-
-    for line in lines:
-        # Detect heading
-        if line.startswith('#'):
-            # Save previous section if it has content
-            if current_section:
-                section_content = '\n'.join(current_section).strip()
-                if section_content and len(section_content) > 50:  # Skip tiny sections
-                    chunks.append({
-                        'content': section_content,
-                        'section': ' > '.join(current_headings) if current_headings else 'Introduction',
-                        'source': source,
-                    })
-                current_section = []
-
-            # Update heading stack
-            level = len(line) - len(line.lstrip('#'))
-            heading_text = line.lstrip('#').strip()
-
-            # Trim heading stack to current level
-            current_headings = current_headings[:level-1]
-            current_headings.append(heading_text)
-
-        current_section.append(line)
-
-    # Don't forget the last section
-    if current_section:
-        section_content = '\n'.join(current_section).strip()
-        if section_content and len(section_content) > 50:
-            chunks.append({
-                'content': section_content,
-                'section': ' > '.join(current_headings) if current_headings else 'Content',
-                'source': source,
-            })
-
-    return chunks
-
-
-def _ingest_document(path: str, tags: list = None) -> int:
-    """Ingest a single document into memory. Returns chunk count."""
-    full_path = DOCS_ROOT / path
-    if not full_path.exists():
-        return 0
-
-    content = full_path.read_text()
-    chunks = _chunk_document(content, path)
-
-    if not chunks:
-        return 0
-
-    conn = get_connection()
-    now = datetime.now().isoformat()
-
-    # Infer tags from path if not provided
-    if not tags:
-        tags = []
-        path_lower = path.lower()
-        for tag_hint in ['infra', 'agents', 'apps', 'shared', 'pipelines', 'ecs', 'lambda']:
-            if tag_hint in path_lower:
-                tags.append(tag_hint)
-        if not tags:
-            tags = ['general']
-
-    tags_str = ' '.join(tags)  # Space-separated for FTS
-    tags_csv = ','.join(tags)  # Comma-separated for metadata
-
-    inserted = 0
-    try:
-        for chunk in chunks:
-            content_hash = _hash_content(chunk['content'])
-
-            # Check for duplicate
-            existing = conn.execute(
-                "SELECT id FROM chunk_meta WHERE content_hash = ?", (content_hash,)
-            ).fetchone()
-
-            if existing:
-                continue  # Skip duplicate
-
-            # Insert into metadata table
-            cursor = conn.execute("""
-                INSERT INTO chunk_meta (source, section, tags, chunk_type, created_at, content_hash)
-                VALUES (?, ?, ?, 'doc', ?, ?)
-            """, (chunk['source'], chunk['section'], tags_csv, now, content_hash))
-
-            # Insert into FTS table
-            conn.execute("""
-                INSERT INTO chunks_fts (rowid, content, source, section, tags)
-                VALUES (?, ?, ?, ?, ?)
-            """, (cursor.lastrowid, chunk['content'], chunk['source'], chunk['section'], tags_str))
-
-            inserted += 1
-
-        conn.commit()
-    finally:
-        conn.close()
-
-    return inserted
+        release_connection(conn)
 
 
 def tool_memory_refresh(path: str = None) -> dict:
@@ -901,50 +856,8 @@ def tool_memory_refresh(path: str = None) -> dict:
     Returns:
         Dictionary with deleted, ingested, and sources counts.
     """
-    conn = get_connection()
-
-    if path:
-        # Single document refresh
-        sources = [path]
-    else:
-        # All docs - get unique sources where type='doc'
-        rows = conn.execute(
-            "SELECT DISTINCT source FROM chunk_meta WHERE chunk_type = 'doc'"
-        ).fetchall()
-        sources = [row['source'] for row in rows]
-
-    deleted = 0
-    ingested = 0
-
-    try:
-        for source in sources:
-            # Delete existing doc chunks for this source
-            chunks = conn.execute(
-                "SELECT id FROM chunk_meta WHERE source = ? AND chunk_type = 'doc'",
-                (source,)
-            ).fetchall()
-
-            for chunk in chunks:
-                conn.execute("DELETE FROM chunks_fts WHERE rowid = ?", (chunk['id'],))
-                conn.execute("DELETE FROM chunk_meta WHERE id = ?", (chunk['id'],))
-                deleted += 1
-
-            conn.commit()
-
-        # Close connection before re-ingesting
-        conn.close()
-
-        # Re-ingest each source if file exists
-        for source in sources:
-            full_path = DOCS_ROOT / source
-            if full_path.exists():
-                ingested += _ingest_document(source)
-
-    except Exception:
-        conn.close()
-        raise
-
-    return {'deleted': deleted, 'ingested': ingested, 'sources': len(sources)}
+    # doctool owns the ingest pipeline; quiet keeps its progress off stdout
+    return DocMemory().refresh(path, quiet=True)
 
 
 # =============================================================================
@@ -58,13 +58,31 @@ CREATE TABLE IF NOT EXISTS chunk_meta (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     source TEXT NOT NULL,             -- file path or session identifier
     section TEXT,                     -- heading/section path
-    tags TEXT,                        -- comma-separated tags
+    tags TEXT,                        -- legacy comma-separated tags (see chunks_fts.tags)
     chunk_type TEXT DEFAULT 'doc',    -- 'doc', 'session', 'decision', 'note'
     created_at TEXT NOT NULL,
-    content_hash TEXT UNIQUE          -- SHA256 hash for deduplication
+    content_hash TEXT UNIQUE          -- BLAKE2b-256 hex hash for deduplication
 );
 
 -- Index for chunk queries
 CREATE INDEX IF NOT EXISTS idx_chunk_meta_source ON chunk_meta(source);
 CREATE INDEX IF NOT EXISTS idx_chunk_meta_type ON chunk_meta(chunk_type);
 CREATE INDEX IF NOT EXISTS idx_chunk_meta_created ON chunk_meta(created_at);
+
+-- Tags live only in chunks_fts.tags (searched via tags:(...) MATCH); drop
+-- the unused chunk_tags table older versions of this schema created
+DROP TABLE IF EXISTS chunk_tags;
+
+-- Whole-file fingerprints: lets ingest skip documents unchanged since last run
+CREATE TABLE IF NOT EXISTS file_hashes (
+    path TEXT PRIMARY KEY,            -- relative to _docs/
+    mtime_ns INTEGER NOT NULL,        -- st_mtime_ns at last ingest
+    size INTEGER NOT NULL,            -- st_size at last ingest
+    whole_hash TEXT NOT NULL          -- BLAKE2b-256 hex hash of the file bytes
+);
+
+-- Key/value markers for one-shot data migrations run by `doctool index init`
+CREATE TABLE IF NOT EXISTS schema_meta (
+    key TEXT PRIMARY KEY,             -- e.g., 'hash_algo'
+    value TEXT NOT NULL
+);
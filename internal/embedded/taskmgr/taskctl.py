@@ -23,10 +23,22 @@ sys.path.insert(0, str(Path.home() / ".claude/skills/doc-sync"))
 from doctool import DocMemory
 
 
+def start_bd(*args):
+    """Start a bd command without waiting for it; collect it with wait_bd()."""
+    return subprocess.Popen(
+        ["bd", *args], stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
+    )
+
+
+def wait_bd(proc):
+    """Wait for a start_bd() process and return (stdout, stderr, returncode)."""
+    stdout, stderr = proc.communicate()
+    return stdout.strip(), stderr.strip(), proc.returncode
+
+
 def run_bd(*args):
     """Run a bd command and return (stdout, stderr, returncode)."""
-    result = subprocess.run(["bd", *args], capture_output=True, text=True)
-    return result.stdout.strip(), result.stderr.strip(), result.returncode
+    return wait_bd(start_bd(*args))
 
 
 def get_memory():
@@ -73,27 +85,30 @@ def cmd_close(args):
     show_stdout, _, show_rc = run_bd("show", args.id)
     original_desc = show_stdout if show_rc == 0 else "(could not retrieve)"
 
-    stdout, stderr, rc = run_bd("close", args.id)
-    if rc != 0:
-        print(f"bd close failed: {stderr}", file=sys.stderr)
-        sys.exit(1)
-
-    print(stdout)
+    # Close via bd, recovering the original tags from memory meanwhile
+    close_proc = start_bd("close", args.id)
+    try:
+        memory = get_memory()
+        original_tags = ["task", "task-closed"]
+        results = memory.search(f"task {args.id}", limit=1)
+        if results:
+            existing_tags = results[0].get("tags", "")
+            if existing_tags:
+                for t in existing_tags.split(","):
+                    t = t.strip()
+                    if t and t not in original_tags:
+                        original_tags.append(t)
+    finally:
+        # A failed close exits before any memory write, even if the lookup failed
+        stdout, stderr, rc = wait_bd(close_proc)
+        if rc != 0:
+            print(f"bd close failed: {stderr}", file=sys.stderr)
+            sys.exit(1)
+
+        print(stdout)
 
     now = datetime.now().isoformat()
 
-    # Try to recover original tags from memory
-    memory = get_memory()
-    original_tags = ["task", "task-closed"]
-    results = memory.search(f"task {args.id}", limit=1)
-    if results:
-        existing_tags = results[0].get("tags", "")
-        if existing_tags:
-            for t in existing_tags.split(","):
-                t = t.strip()
-                if t and t not in original_tags:
-                    original_tags.append(t)
-
     summary = args.summary or "No summary provided"
     content = (
         f"Task #{args.id} closed\n"
@@ -170,8 +185,13 @@ def cmd_snapshot(args):
 
 def cmd_context(args):
     """Show task details + related memory entries."""
-    # Get task details from bd
-    stdout, stderr, rc = run_bd("show", args.id)
+    # Get task details from bd, searching memory for related entries meanwhile
+    show_proc = start_bd("show", args.id)
+    try:
+        memory = get_memory()
+        results = memory.search(f"task {args.id}", limit=10)
+    finally:
+        stdout, stderr, rc = wait_bd(show_proc)
     if rc != 0:
         print(f"bd show failed: {stderr}", file=sys.stderr)
         sys.exit(1)
@@ -180,10 +200,6 @@ def cmd_context(args):
     print(stdout)
     print()
 
-    # Search memory for related entries
-    memory = get_memory()
-    results = memory.search(f"task {args.id}", limit=10)
-
     if results:
         print(f"=== Memory ({len(results)} entries) ===")
         for i, r in enumerate(results, 1):